@@ -1,18 +1,28 @@
 import os
+import stat
 import re
 import shutil
+import tempfile
+import threading
 import uuid
 import json
 import base64
-import requests
-from typing import List, Dict, Optional
+import hashlib
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import httpx
+import aiofiles
+from typing import List, Dict, Optional, Tuple, BinaryIO
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
-import PyPDF2
+import pypdf
 import io
 
 
@@ -42,15 +52,67 @@ app.add_middleware(
 UPLOAD_DIR = "uploads"
 AUDIO_DIR = "generated_audio"
 STATIC_DIR = "static"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(AUDIO_DIR, exist_ok=True)
-os.makedirs(STATIC_DIR, exist_ok=True)
+JOBS_DIR = "jobs"
+for directory in (UPLOAD_DIR, AUDIO_DIR, STATIC_DIR, JOBS_DIR):
+    os.makedirs(directory, exist_ok=True)
+
+# Words that make the Murf API reject a request, mapped to safe replacements.
+# Matched as whole words only, so "peacock" is left alone.
+SANITIZE_REPLACEMENTS = {
+    "cock": "rooster",
+}
+_SANITIZER = re.compile(
+    r'\b(' + '|'.join(re.escape(w) for w in SANITIZE_REPLACEMENTS) + r')\b',
+    re.IGNORECASE
+)
+
+# ffmpeg is used to stitch chunk MP3s into one clean file (stream copy, no re-encode);
+# its mp3 muxer writes a fresh Xing header, so duration and seeking are correct.
+# Without it we fall back to concatenating the raw frames with ID3 tags stripped.
+FFMPEG_PATH = shutil.which("ffmpeg")
+
+# PDFs with at least this many pages are parsed across a process pool.
+# Below it, spawning/pickling overhead costs more than it saves.
+PDF_PARALLEL_MIN_PAGES = 20
+# Each worker parses the whole PDF, so keep the pool small to bound memory
+PDF_WORKERS = min(os.cpu_count() or 1, 4)
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+# Extraction runs in to_thread workers, so pool creation/reset must be locked
+_pdf_pool_lock = threading.Lock()
+
+# Sentence boundary: end punctuation followed by whitespace and a capital/quote
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z"\'(])')
+
+# Conversion cache: maps "{pdf_hash}_{voice_hash}" -> generated audio file.
+# Kept outside AUDIO_DIR so it isn't served as a static file.
+CACHE_INDEX_PATH = "cache_index.json"
+CONVERSION_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
 
 app.mount("/audio", StaticFiles(directory=AUDIO_DIR), name="audio")
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 MURF_API_KEY = os.getenv("MURF_API_KEY")
 MURF_API_URL = "https://api.murf.ai/v1/speech/generate"
+# Murf accepts up to 3000 characters of text per generate request
+MURF_MAX_CHARS = 3000
+# Max number of chunks sent to Murf at the same time (keep under their rate limits)
+MURF_MAX_CONCURRENCY = 8
+
+# One shared async HTTP client for all outgoing calls (Murf API + audio downloads),
+# so nothing in a request handler blocks the event loop. Keep-alive connections
+# are pooled across chunks and requests, so only the first call pays for the TLS
+# handshake; HTTP/2 lets back-to-back calls share one connection.
+@app.on_event("startup")
+async def open_http_client():
+    app.state.http = httpx.AsyncClient(
+        timeout=120,
+        http2=True,
+        limits=httpx.Limits(max_connections=2 * MURF_MAX_CONCURRENCY, max_keepalive_connections=2 * MURF_MAX_CONCURRENCY),
+    )
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await app.state.http.aclose()
 
 # Serve the UI
 @app.get("/")
@@ -64,14 +126,20 @@ async def read_root():
 # We will fetch voices dynamically to ensure they are valid.
 CACHED_VOICES = []
 
-def fetch_murf_voices():
+# The raw Murf voice list is persisted to disk so a restart doesn't need a
+# round-trip to Murf before the first /voices request can be answered.
+MURF_VOICES_URL = "https://api.murf.ai/v1/speech/voices"
+VOICES_CACHE_PATH = "voices_cache.json"
+VOICES_CACHE_TTL = 24 * 60 * 60  # seconds
+
+async def fetch_murf_voices():
     if not MURF_API_KEY:
         print("Cannot fetch voices: API Key not set.")
         return []
         
     try:
         headers = {"api-key": MURF_API_KEY, "Accept": "application/json"}
-        response = requests.get("https://api.murf.ai/v1/speech/voices", headers=headers)
+        response = await app.state.http.get(MURF_VOICES_URL, headers=headers, timeout=30)
         if response.status_code == 200:
             return response.json()
         print(f"Failed to fetch voices: {response.status_code}")
@@ -80,85 +148,226 @@ def fetch_murf_voices():
         print(f"Error fetching voices: {e}")
         return []
 
-def get_voice_by_criteria(all_voices, locale, gender):
-    """Finds the first available voice matching locale and gender."""
+def load_voices_cache():
+    """Returns the voice list from disk, or None if missing or older than the TTL."""
+    try:
+        if time.time() - os.path.getmtime(VOICES_CACHE_PATH) > VOICES_CACHE_TTL:
+            return None
+        with open(VOICES_CACHE_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def save_voices_cache(all_voices):
+    tmp_path = VOICES_CACHE_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(all_voices, f)
+    os.replace(tmp_path, VOICES_CACHE_PATH)
+
+async def get_all_voices():
+    all_voices = load_voices_cache()
+    if all_voices is not None:
+        return all_voices
+
+    all_voices = await fetch_murf_voices()
+    # Only persist a real answer, so a failed fetch is retried next time
+    if all_voices:
+        save_voices_cache(all_voices)
+    return all_voices
+
+def index_voices_by_criteria(all_voices) -> Dict[Tuple[str, str], str]:
+    """Maps (locale, gender) to the first available voice ID for that pair."""
     # Locales: en-US, en-UK, en-AU
     # Gender: Male, Female
+    # Prefer 'Promo' or 'Narrative' style if available, but take any for now
+    by_key: Dict[Tuple[str, str], str] = {}
     for voice in all_voices:
-        if voice.get("locale") == locale and voice.get("gender") == gender:
-            # Prefer 'Promo' or 'Narrative' style if available, but take any for now
-            return voice["voiceId"]
-    return None
+        by_key.setdefault((voice.get("locale"), voice.get("gender")), voice["voiceId"])
+    return by_key
+
+def build_voice_categories(all_voices):
+    categories = [
+        ("American Male", "en-US", "Male"),
+        ("American Female", "en-US", "Female"),
+        ("British Male", "en-UK", "Male"),
+        ("British Female", "en-UK", "Female"),
+        ("Australian Male", "en-AU", "Male"),
+        ("Australian Female", "en-AU", "Female"),
+    ]
+    
+    by_key = index_voices_by_criteria(all_voices)
+    return [
+        {"category": name, "id": by_key.get((locale, gender), "placeholder")}
+        for name, locale, gender in categories
+    ]
+
+@app.on_event("startup")
+async def load_voices():
+    global CACHED_VOICES
+    all_voices = await get_all_voices()
+    if all_voices:
+        CACHED_VOICES = build_voice_categories(all_voices)
 
 @app.get("/voices")
 async def get_voices():
     global CACHED_VOICES
     if not CACHED_VOICES:
-        all_voices = fetch_murf_voices()
-        
-        categories = [
-            ("American Male", "en-US", "Male"),
-            ("American Female", "en-US", "Female"),
-            ("British Male", "en-UK", "Male"),
-            ("British Female", "en-UK", "Female"),
-            ("Australian Male", "en-AU", "Male"),
-            ("Australian Female", "en-AU", "Female"),
-        ]
-        
-        start_list = []
-        for name, locale, gender in categories:
-            vid = get_voice_by_criteria(all_voices, locale, gender)
-            if vid:
-                start_list.append({"category": name, "id": vid})
-            else:
-                 start_list.append({"category": name, "id": "placeholder"})
-                 
-        CACHED_VOICES = start_list
+        all_voices = await get_all_voices()
+        CACHED_VOICES = build_voice_categories(all_voices)
 
     return CACHED_VOICES
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    text_content = ""
+def _extract_page_range(args) -> List[str]:
+    """Process pool worker: extracts text from pages [start, stop) of a PDF file."""
+    pdf_path, start, stop = args
+    reader = pypdf.PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # The pool is created from a worker thread while the server's own threads
+            # are running; forking a multithreaded process can deadlock the child,
+            # so start workers as fresh interpreters instead.
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pdf_pool
+
+def _reset_pdf_pool(broken_pool: ProcessPoolExecutor):
+    """Drops a broken pool, unless another thread already replaced it."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is broken_pool:
+            _pdf_pool = None
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+@app.on_event("shutdown")
+def close_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        pool, _pdf_pool = _pdf_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _extract_pages_parallel(pool: ProcessPoolExecutor, pdf_stream: BinaryIO, num_pages: int) -> List[str]:
+    # Pages are independent, so split them into one contiguous range per
+    # worker. Each worker re-opens the PDF once for its whole range.
+    # Workers get a path to a temp copy rather than the bytes, so the PDF isn't
+    # pickled to every worker or pulled into this process' memory.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "upload.pdf")
+        pdf_stream.seek(0)
+        with open(pdf_path, "wb") as f:
+            shutil.copyfileobj(pdf_stream, f, 1 << 20)
+
+        step = -(-num_pages // PDF_WORKERS)
+        ranges = [(pdf_path, start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+        page_texts = []
+        for texts in pool.map(_extract_page_range, ranges):
+            page_texts.extend(texts)
+        return page_texts
+
+def extract_text_from_pdf(pdf_stream: BinaryIO) -> str:
+    # Collect page texts in a list and join once; repeated += is slow on big PDFs
+    parts = []
     try:
-        with open(pdf_path, "rb") as pdf_file:
-            reader = PyPDF2.PdfReader(pdf_file)
-            for page in reader.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text_content += extracted + "\n"
+        reader = pypdf.PdfReader(pdf_stream)
+        num_pages = len(reader.pages)
+
+        page_texts = None
+        if num_pages >= PDF_PARALLEL_MIN_PAGES and PDF_WORKERS > 1:
+            pool = _get_pdf_pool()
+            try:
+                page_texts = _extract_pages_parallel(pool, pdf_stream, num_pages)
+            except BrokenProcessPool as e:
+                # A worker died (e.g. OOM-killed). Drop the pool so the next call
+                # builds a fresh one, and parse this PDF in-process instead.
+                print(f"PDF process pool broke, falling back to sequential extraction: {e}")
+                _reset_pdf_pool(pool)
+
+        if page_texts is None:
+            page_texts = [page.extract_text() for page in reader.pages]
+        parts = [t for t in page_texts if t]
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return ""
-    return text_content
+    return "".join(p + "\n" for p in parts)
+
+def sanitize_text(text: str) -> str:
+    """Replaces words the TTS API refuses (e.g. "cock" -> "rooster")."""
+    return _SANITIZER.sub(lambda m: SANITIZE_REPLACEMENTS[m.group(1).lower()], text)
+
+def prepare_chunks(text: str) -> List[str]:
+    """Sanitizes text and splits it into chunks ready to send to Murf."""
+    # Sanitize before chunking: replacements can make the text longer, and
+    # chunks are packed right up to Murf's per-request character limit.
+    return chunk_text(sanitize_text(text))
+
+def split_long_sentence(sentence: str, limit: int) -> List[str]:
+    """Splits a sentence longer than `limit` at the last space that fits."""
+    pieces = []
+    while len(sentence) > limit:
+        cut = sentence.rfind(' ', 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        pieces.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        pieces.append(sentence)
+    return pieces
 
-def chunk_text(text: str, chunk_size: int = 2000) -> List[str]:
+def chunk_text(text: str, chunk_size: int = MURF_MAX_CHARS, min_chunk_size: int = 300) -> List[str]:
     """Splits text into chunks to respect API limits."""
-    # A simple character count split. 
-    # Improvement: Split by sentence or paragraph to avoid cutting words.
-    chunks = []
-    
-    # Simple logic: split by double newlines (paragraphs) first
-    paragraphs = text.split('\n\n')
-    current_chunk = ""
-    
-    for para in paragraphs:
-        if len(current_chunk) + len(para) < chunk_size:
-            current_chunk += para + "\n\n"
-        else:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = para + "\n\n"
-            # If a single paragraph is too large, force split it
-            while len(current_chunk) > chunk_size:
-                chunks.append(current_chunk[:chunk_size])
-                current_chunk = current_chunk[chunk_size:]
-    
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-        
-    return chunks
+    # Greedily packs whole sentences into chunks of up to `chunk_size` characters,
+    # so we make as few API calls as possible and never cut mid-sentence
+    # (unless a single sentence is longer than the limit).
+    # Paragraph breaks are kept inside a chunk as blank lines.
+    # Each chunk is a list of (separator, sentence) pairs until the end, so
+    # sentences can still be moved between chunks when rebalancing the tail.
+    chunks: List[List[Tuple[str, str]]] = []
+    buf: List[Tuple[str, str]] = []
+    buf_len = 0
+
+    for para in text.split('\n\n'):
+        para = para.strip()
+        if not para:
+            continue
+
+        sentences = []
+        for sentence in _SENTENCE_SPLIT.split(para):
+            sentences.extend(split_long_sentence(sentence, chunk_size))
+
+        for i, sentence in enumerate(sentences):
+            sep = ' ' if i > 0 else '\n\n'
+            if buf and buf_len + len(sep) + len(sentence) > chunk_size:
+                chunks.append(buf)
+                buf, buf_len = [], 0
+            buf_len += (len(sep) if buf else 0) + len(sentence)
+            buf.append((sep, sentence))
+
+    if buf:
+        chunks.append(buf)
+
+    def joined_len(pieces: List[Tuple[str, str]]) -> int:
+        return sum(len(sep) + len(sentence) for sep, sentence in pieces) - len(pieces[0][0])
+
+    # Avoid ending on a tiny chunk: move trailing sentences from the previous
+    # chunk into the last one until it reaches min_chunk_size
+    if len(chunks) > 1:
+        prev, last = chunks[-2], chunks[-1]
+        while joined_len(last) < min_chunk_size and len(prev) > 1:
+            moved = prev[-1]
+            if joined_len([moved] + last) > chunk_size:
+                break
+            last.insert(0, prev.pop())
 
-def call_murf_api(text: str, voice_id: str) -> bytes:
+    return [''.join(sep + sentence for sep, sentence in pieces)[len(pieces[0][0]):] for pieces in chunks]
+
+async def call_murf_api(client: httpx.AsyncClient, sem: asyncio.Semaphore, text: str, voice_id: str, out_path: str):
+    """Generates audio for `text` and writes the MP3 to `out_path`."""
     if not MURF_API_KEY:
         raise Exception("MURF_API_KEY not set")
     
@@ -171,6 +380,9 @@ def call_murf_api(text: str, voice_id: str) -> bytes:
         "sampleRate": 48000,
         "format": "MP3",
         "channel": "Stereo",
+        # Ask for a download URL rather than base64 audio, so the MP3 can be
+        # streamed to disk instead of decoded in memory.
+        "encodeAsBase64": False,
         # Murf API (v1/speech/generate) returns JSON with "audioFile" (url) or "encodedImage" (base64)?
         # Actually usually it returns a URL `audioFile`.
         # Let's check the response.
@@ -182,119 +394,431 @@ def call_murf_api(text: str, voice_id: str) -> bytes:
         "api-key": MURF_API_KEY
     }
     
-    response = requests.post(MURF_API_URL, json=payload, headers=headers)
+    async with sem:
+        response = await client.post(MURF_API_URL, json=payload, headers=headers)
     
-    if response.status_code != 200:
-        raise Exception(f"Murf API Error: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise Exception(f"Murf API Error: {response.status_code} - {response.text}")
+            
+        data = response.json()
         
-    data = response.json()
-    
-    # Check for direct audio URL
-    if "audioFile" in data:
-        audio_url = data["audioFile"]
-        # Download the audio
-        audio_res = requests.get(audio_url)
-        return audio_res.content
-    elif "encodedAudio" in data:
-        # If it returns base64
-        return base64.b64decode(data["encodedAudio"])
-    else:
-        raise Exception(f"Unexpected API response: {data}")
+        # Check for direct audio URL
+        if "audioFile" in data:
+            audio_url = data["audioFile"]
+            # Stream the audio straight to disk instead of buffering it in memory
+            async with client.stream("GET", audio_url) as audio_res:
+                if audio_res.status_code != 200:
+                    raise Exception(f"Audio download failed: {audio_res.status_code}")
+                async with aiofiles.open(out_path, "wb") as out_f:
+                    async for block in audio_res.aiter_bytes(1 << 15):
+                        await out_f.write(block)
+        elif "encodedAudio" in data:
+            # If it returns base64 (decoding multi-MB payloads is CPU work, keep it off the loop)
+            audio = await asyncio.to_thread(base64.b64decode, data["encodedAudio"])
+            async with aiofiles.open(out_path, "wb") as out_f:
+                await out_f.write(audio)
+        else:
+            raise Exception(f"Unexpected API response: {data}")
+
+
+
+# MPEG audio Layer III tables, used to find the length of the first frame
+_MP3_BITRATES = {
+    "v1": [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    "v2": [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+def _id3v2_size(data: bytes) -> int:
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    # Tag size is a 28-bit "syncsafe" integer, plus 10 byte header (+10 footer)
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    return size + (20 if data[5] & 0x10 else 10)
+
+def _mp3_frame_length(header: bytes) -> int:
+    """Length in bytes of the Layer III frame starting with `header`, or 0."""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return 0
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_idx = header[2] >> 4
+    rate_idx = (header[2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return 0
+    bitrate = _MP3_BITRATES["v1" if version == 3 else "v2"][bitrate_idx] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+    padding = (header[2] >> 1) & 0x01
+    return (144 if version == 3 else 72) * bitrate // sample_rate + padding
+
+def strip_id3_tags(data: bytes, keep_v2: bool = False, keep_v1: bool = False) -> bytes:
+    """Removes the leading ID3v2 tag and/or trailing ID3v1 tag from an MP3."""
+    if not keep_v2:
+        data = data[_id3v2_size(data):]
+    if not keep_v1 and len(data) >= 128 and data[-128:-125] == b"TAG":
+        data = data[:-128]
+    return data
+
+def strip_vbr_header(data: bytes) -> bytes:
+    """Drops a Xing/Info/VBRI header frame at the start of the audio.
+
+    These frames describe a single chunk's duration, so once chunks are joined
+    they make players report the wrong length and break seeking.
+    """
+    start = _id3v2_size(data)
+    frame_len = _mp3_frame_length(data[start:start + 4])
+    if not frame_len:
+        return data
+
+    # The tags sit at fixed offsets: Xing/Info right after the side info (whose
+    # size depends on MPEG version and mono/stereo), VBRI always at byte 36.
+    # Only look there, a normal audio frame may contain these bytes by chance.
+    mpeg1 = (data[start + 1] >> 3) & 0x03 == 3
+    mono = (data[start + 3] >> 6) == 3
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    xing_at = start + 4 + side_info
+    if data[xing_at:xing_at + 4] in (b"Xing", b"Info") or data[start + 36:start + 40] == b"VBRI":
+        return data[:start] + data[start + frame_len:]
+    return data
+
+async def concat_mp3_parts(part_paths: List[str], output_path: str):
+    """Stitches MP3 chunk files (in order) into a single file at output_path."""
+    if FFMPEG_PATH:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            list_path = os.path.join(tmp_dir, "parts.txt")
+            async with aiofiles.open(list_path, "w") as f:
+                await f.writelines(f"file '{os.path.abspath(p)}'\n" for p in part_paths)
 
+            proc = await asyncio.create_subprocess_exec(
+                FFMPEG_PATH, "-hide_banner", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-c", "copy", "-f", "mp3", "-y", output_path,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                raise Exception(f"ffmpeg concat failed: {stderr.decode(errors='replace')}")
+        return
+
+    # Fallback: keep the first chunk's ID3v2 header and the last chunk's ID3v1 tag,
+    # drop the ones in between so players don't stop or glitch at chunk seams.
+    # Per-chunk VBR headers are dropped too, so players derive the duration from
+    # the whole file instead of the first chunk.
+    last = len(part_paths) - 1
+    async with aiofiles.open(output_path, "wb") as out_f:
+        for i, part_path in enumerate(part_paths):
+            async with aiofiles.open(part_path, "rb") as part_f:
+                part = await part_f.read()
+            part = strip_id3_tags(part, keep_v2=(i == 0), keep_v1=(i == last))
+            await out_f.write(strip_vbr_header(part))
+
+def load_cache_index() -> Dict[str, Dict]:
+    try:
+        with open(CACHE_INDEX_PATH, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_cache_index(index: Dict[str, Dict]):
+    tmp_path = CACHE_INDEX_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, CACHE_INDEX_PATH)
+
+def cache_key(pdf_hash: str, voice_id: str) -> str:
+    # voice_id comes from the client: hash it so the key is always filename-safe,
+    # bounded in length, and two different voices can never map to the same file
+    voice_hash = hashlib.sha256(voice_id.encode("utf-8")).hexdigest()[:16]
+    return f"{pdf_hash}_{voice_hash}"
+
+def record_cache_entry(key: str, entry: Dict):
+    """Adds a cached file to the index so it gets evicted once it expires."""
+    index = load_cache_index()
+    index[key] = dict(entry, created=time.time())
+    save_cache_index(index)
+
+def evict_expired_conversions():
+    """Deletes cached audiobooks and text extractions older than the TTL."""
+    index = load_cache_index()
+    now = time.time()
+    expired = {k: e for k, e in index.items() if now - e.get("created", 0) > CONVERSION_CACHE_TTL}
+    if not expired:
+        return
+
+    # Text extractions have their own entries ("text_file"), so text cached for
+    # a conversion that never finished is evicted too
+    for key, entry in expired.items():
+        del index[key]
+        if "text_file" in entry:
+            path = os.path.join(UPLOAD_DIR, entry["text_file"])
+        else:
+            path = os.path.join(AUDIO_DIR, entry["filename"])
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    # The extracted text is shared by every voice of the same PDF,
+    # only drop it once no cached conversion of that PDF is left
+    live_hashes = {e.get("pdf_hash") for e in index.values()}
+    for entry in expired.values():
+        pdf_hash = entry.get("pdf_hash")
+        if pdf_hash and pdf_hash not in live_hashes:
+            try:
+                os.remove(os.path.join(UPLOAD_DIR, f"{pdf_hash}.txt"))
+            except FileNotFoundError:
+                pass
+
+    save_cache_index(index)
+    print(f"Evicted {len(expired)} expired conversions from cache")
+
+@app.on_event("startup")
+async def evict_conversion_cache():
+    evict_expired_conversions()
+    prune_old_jobs()
+
+def conversion_result(output_filename: str, cached: bool = False) -> Dict:
+    return {
+        "status": "success", 
+        "download_url": f"/download/{output_filename}",
+        "playback_url": f"/audio/{output_filename}", 
+        "filename": output_filename,
+        "cached": cached
+    }
+
+# Background conversion jobs. State lives in jobs/{job_id}.json so /jobs/{id}
+# can report progress; ACTIVE_JOBS maps cache key -> job_id for conversions
+# still running, so a retried upload attaches to the existing job.
+ACTIVE_JOBS: Dict[str, str] = {}
+_JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+def job_path(job_id: str) -> str:
+    return os.path.join(JOBS_DIR, f"{job_id}.json")
+
+def save_job(job_id: str, state: Dict):
+    tmp_path = job_path(job_id) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, job_path(job_id))
+
+# Finished job files are kept this long so clients can still poll the result
+JOB_TTL = 24 * 60 * 60  # seconds
+JOB_INTERRUPTED_DETAIL = "Conversion was interrupted by a server restart, please try again"
+
+def release_job(job_id: str, key: str, detail: str):
+    """Marks a job that failed before generation started, and frees its key."""
+    if ACTIVE_JOBS.get(key) == job_id:
+        del ACTIVE_JOBS[key]
+    save_job(job_id, {"job_id": job_id, "status": "failed", "detail": detail})
+
+def prune_old_jobs():
+    """Deletes job files older than JOB_TTL that no running task owns."""
+    now = time.time()
+    active = set(ACTIVE_JOBS.values())
+    for name in os.listdir(JOBS_DIR):
+        if name.split(".", 1)[0] in active:
+            continue
+        path = os.path.join(JOBS_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > JOB_TTL:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def load_job(job_id: str) -> Optional[Dict]:
+    try:
+        with open(job_path(job_id), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
 
 
 @app.get("/download/{filename}")
 async def download_audio(filename: str):
     file_path = os.path.join(AUDIO_DIR, filename)
-    if not os.path.exists(file_path):
+    # Stat once here and hand the result to FileResponse, which would otherwise
+    # stat the file again before sending it.
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(file_stat.st_mode):
         raise HTTPException(status_code=404, detail="File not found")
     
     return FileResponse(
         path=file_path, 
         filename=filename, 
-        media_type="audio/mpeg"
+        media_type="audio/mpeg",
+        stat_result=file_stat
     )
 
+async def run_conversion(job_id: str, key: str, chunks: List[str], voice_id: str, output_filename: str):
+    """Background task: generates the audio for `chunks` and updates the job state."""
+    output_path = os.path.join(AUDIO_DIR, output_filename)
+    state = {"job_id": job_id, "status": "processing", "progress": 0, "completed": 0, "total": 0}
+
+    try:
+        jobs = [(i, chunk) for i, chunk in enumerate(chunks) if chunk.strip()]
+        state["total"] = len(jobs)
+        save_job(job_id, state)
+
+        sem = asyncio.Semaphore(MURF_MAX_CONCURRENCY)
+
+        async def generate(chunk: str, part_path: str):
+            await call_murf_api(app.state.http, sem, chunk, voice_id, part_path)
+            state["completed"] += 1
+            state["progress"] = int(100 * state["completed"] / len(jobs))
+            save_job(job_id, state)
+
+        # Send all chunks to Murf concurrently, bounded by the semaphore.
+        # Each chunk's audio is streamed into its own part file, named by chunk
+        # position so the audio stays in order.
+        print(f"[{job_id}] Generating audio for {len(jobs)} chunks (concurrency {MURF_MAX_CONCURRENCY})...")
+        with tempfile.TemporaryDirectory() as work_dir:
+            part_paths = [os.path.join(work_dir, f"part_{i}.mp3") for i, _ in jobs]
+            tasks = [
+                asyncio.create_task(generate(chunk, part_path))
+                for (_, chunk), part_path in zip(jobs, part_paths)
+            ]
+            try:
+                # Stop at the first failed chunk: the job can't succeed anymore, so
+                # don't keep paying Murf for the chunks still pending
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            for (i, _), task in zip(jobs, tasks):
+                if not task.cancelled() and task.exception() is not None:
+                    print(f"[{job_id}] Failed to generate audio for chunk {i}: {task.exception()}")
+                    raise Exception(f"Text-to-Speech generation failed: {str(task.exception())}")
+
+            # Stitch the chunks into one MP3. Write to a temp file first so a
+            # half-written MP3 is never picked up as a cache hit.
+            tmp_output_path = f"{output_path}.{uuid.uuid4().hex}.part"
+            try:
+                await concat_mp3_parts(part_paths, tmp_output_path)
+                os.replace(tmp_output_path, output_path)
+            finally:
+                if os.path.exists(tmp_output_path):
+                    os.remove(tmp_output_path)
+
+        # Remember this conversion so it can be evicted once it expires
+        record_cache_entry(key, {"filename": output_filename, "pdf_hash": key.split("_", 1)[0]})
+        evict_expired_conversions()
+
+        state.update(conversion_result(output_filename), progress=100)
+        print(f"[{job_id}] Done: {output_filename}")
+    except asyncio.CancelledError:
+        # Server shutting down mid-job: don't leave it stuck in "processing"
+        state.update(status="failed", detail=JOB_INTERRUPTED_DETAIL)
+        raise
+    except Exception as e:
+        state.update(status="failed", detail=str(e))
+    finally:
+        ACTIVE_JOBS.pop(key, None)
+        save_job(job_id, state)
+        prune_old_jobs()
+
 @app.post("/convert")
 async def convert_pdf(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...), 
     voice_id: str = Form(...) 
 ):
     print(f"Processing conversion for voice: {voice_id}")
 
-    filename = f"{uuid.uuid4()}_{file.filename}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
+    # Fingerprint the upload so repeated conversions can be served from disk.
+    # Hash it in 1MB blocks straight from FastAPI's spooled upload file instead
+    # of pulling the whole PDF into memory.
+    hasher = hashlib.sha256()
+    while block := await file.read(1 << 20):
+        hasher.update(block)
+    pdf_hash = hasher.hexdigest()
+    key = cache_key(pdf_hash, voice_id)
+    output_filename = f"{key}.mp3"
+    output_path = os.path.join(AUDIO_DIR, output_filename)
+
+    if os.path.exists(output_path):
+        print(f"Cache hit: {output_filename}")
+        return JSONResponse(conversion_result(output_filename, cached=True))
+
+    # Same PDF + voice already being generated (e.g. a client retry)
+    if key in ACTIVE_JOBS:
+        job_id = ACTIVE_JOBS[key]
+        return JSONResponse({"status": "processing", "job_id": job_id, "status_url": f"/jobs/{job_id}"}, status_code=202)
+
+    # Claim the key before the first await below, so a retry that arrives while
+    # we are still extracting attaches to this job instead of starting another
+    job_id = uuid.uuid4().hex
+    ACTIVE_JOBS[key] = job_id
+    save_job(job_id, {"job_id": job_id, "status": "processing", "progress": 0, "completed": 0, "total": 0})
+
+    text_cache_path = os.path.join(UPLOAD_DIR, f"{pdf_hash}.txt")
     
     try:
-        with open(filepath, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # 1. Extract
-        text = extract_text_from_pdf(filepath)
+        # 1. Extract (reuse text from an earlier conversion of the same PDF)
+        if os.path.exists(text_cache_path):
+            print("Using cached text extraction")
+            async with aiofiles.open(text_cache_path, "r", encoding="utf-8") as f:
+                text = await f.read()
+        else:
+            # Parse straight from the upload file, we never make our own copy of the PDF.
+            # Parsing is CPU-bound, so run it in a worker thread to keep the loop free.
+            await file.seek(0)
+            text = await asyncio.to_thread(extract_text_from_pdf, file.file)
+            if text.strip():
+                # Write to a temp file and rename, so a concurrent conversion of the
+                # same PDF (other voice) never reads a half-written text cache
+                tmp_text_path = f"{text_cache_path}.{uuid.uuid4().hex}.tmp"
+                async with aiofiles.open(tmp_text_path, "w", encoding="utf-8") as f:
+                    await f.write(text)
+                os.replace(tmp_text_path, text_cache_path)
+                record_cache_entry(f"{pdf_hash}.txt", {"text_file": f"{pdf_hash}.txt", "pdf_hash": pdf_hash})
+
         if not text.strip():
              raise HTTPException(status_code=400, detail="No text extracted from PDF")
              
-        # 2. Chunk
-        chunks = chunk_text(text)
+        # 2. Sanitize and chunk
+        chunks = await asyncio.to_thread(prepare_chunks, text)
         print(f"Text split into {len(chunks)} chunks.")
         
-        # 3. Generate and Concatenate Audio (MP3) directly
-        # We will write chunks directly to the output file as we receive them.
-        output_filename = f"audiobook_{uuid.uuid4()}.mp3"
-        output_path = os.path.join(AUDIO_DIR, output_filename)
-        
-        # Create/Clear file
-        with open(output_path, "wb") as out_f:
-            pass
-
-        for i, chunk in enumerate(chunks):
-            if not chunk.strip(): continue
-            
-            # Sanitize text to avoid API errors (e.g. "cock" -> "rooster")
-            # Use regex to replace whole word only, to avoid changing "peacock"
-            if re.search(r'\bcock\b', chunk, re.IGNORECASE):
-                print("Sanitizing text: replacing 'cock' with 'rooster'")
-                chunk = re.sub(r'\bcock\b', 'rooster', chunk, flags=re.IGNORECASE)
+        # 3. Generate and Concatenate Audio (MP3)
+        # This takes a while for big PDFs, so it runs as a background task after
+        # the response is sent. The client polls /jobs/{job_id} for progress.
+        background_tasks.add_task(run_conversion, job_id, key, chunks, voice_id, output_filename)
 
-            print(f"Processing chunk {i+1}/{len(chunks)}...")
-            try:
-                # Get raw MP3 bytes
-                raw_audio = call_murf_api(chunk, voice_id)
-                
-                # Append to file
-                with open(output_path, "ab") as out_f:
-                    out_f.write(raw_audio)
-                    
-            except Exception as e:
-                print(f"Failed to generate audio for chunk {i}: {e}")
-                raise HTTPException(status_code=500, detail=f"Text-to-Speech generation failed: {str(e)}")
-
-        # Clean up input PDF
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        
-        # URL for playback (Static serve)
-        playback_url = f"{str(requests.Request('GET', 'http://localhost:8000').prepare().url).rstrip('/')}/audio/{output_filename}"
-        # We can just return the local relative path or full URL. Frontend constructs it usually? 
-        # Actually frontend uses the `download_url` from response.
-        # Let's keep `download_url` as the direct download link now? 
-        # or separate playback vs download.
-        
-        # Let's provide both or just the filename so frontend can decide.
-        # Original code returned `download_url`.
-        
-        # In main.py, update the return statement in @app.post("/convert")
-        return JSONResponse({
-            "status": "success", 
-            "download_url": f"/download/{output_filename}",
-            "playback_url": f"/audio/{output_filename}", 
-            "filename": output_filename
-        })
+        return JSONResponse({"status": "processing", "job_id": job_id, "status_url": f"/jobs/{job_id}"}, status_code=202)
 
     except HTTPException as he:
+        release_job(job_id, key, he.detail)
         raise he
     except Exception as e:
-        if os.path.exists(filepath):
-            os.remove(filepath)
+        release_job(job_id, key, str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.on_event("shutdown")
+def fail_active_jobs():
+    # Background tasks don't survive a restart, so nobody would finish these
+    for job_id in list(ACTIVE_JOBS.values()):
+        job = load_job(job_id) or {"job_id": job_id}
+        if job.get("status") == "processing":
+            job.update(status="failed", detail=JOB_INTERRUPTED_DETAIL)
+            save_job(job_id, job)
+    ACTIVE_JOBS.clear()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = load_job(job_id) if _JOB_ID_RE.match(job_id) else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    # A "processing" job that no running task owns was lost (e.g. the server
+    # was killed before the shutdown hook ran). Like ACTIVE_JOBS itself, this
+    # assumes a single worker process.
+    if job.get("status") == "processing" and job_id not in ACTIVE_JOBS.values():
+        job.update(status="failed", detail=JOB_INTERRUPTED_DETAIL)
+        save_job(job_id, job)
+    return job
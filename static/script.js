@@ -130,9 +130,6 @@ convertBtn.addEventListener('click', async () => {
     formData.append('voice_id', voiceId);
 
     try {
-        progressBar.style.width = '60%';
-        statusText.textContent = 'Generating Audio with Murf AI... (This may take a moment)';
-
         const response = await fetch(`${API_BASE}/convert`, {
             method: 'POST',
             body: formData
@@ -143,7 +140,12 @@ convertBtn.addEventListener('click', async () => {
             throw new Error(err.detail || 'Conversion failed');
         }
 
-        const data = await response.json();
+        let data = await response.json();
+
+        // Audio is generated in the background; poll the job until it finishes
+        if (data.job_id) {
+            data = await waitForJob(data.status_url);
+        }
 
         progressBar.style.width = '100%';
         statusText.textContent = 'Done!';
@@ -165,6 +167,33 @@ convertBtn.addEventListener('click', async () => {
     }
 });
 
+const JOB_POLL_INTERVAL_MS = 2000;
+const JOB_POLL_TIMEOUT_MS = 30 * 60 * 1000;
+
+async function waitForJob(statusUrl) {
+    statusText.textContent = 'Generating Audio with Murf AI... (This may take a moment)';
+    const deadline = Date.now() + JOB_POLL_TIMEOUT_MS;
+
+    while (Date.now() < deadline) {
+        const res = await fetch(`${API_BASE}${statusUrl}`);
+        const job = await res.json();
+
+        if (!res.ok || job.status === 'failed') {
+            throw new Error(job.detail || 'Conversion failed');
+        }
+        if (job.status === 'success') {
+            return job;
+        }
+
+        // Map job progress onto the 30%-95% range of the bar
+        progressBar.style.width = `${30 + Math.round((job.progress || 0) * 0.65)}%`;
+        statusText.textContent = `Generating Audio with Murf AI... ${job.completed || 0}/${job.total || '?'} parts`;
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+
+    throw new Error('Conversion is taking too long. Please try again later.');
+}
+
 function showResult(playbackUrl, downloadUrl) {
     resultArea.classList.remove('hidden');
     audioPlayer.src = playbackUrl;
@@ -0,0 +1,23 @@
+from main import MURF_MAX_CHARS, chunk_text, prepare_chunks
+
+
+def test_sanitized_chunks_stay_within_murf_limit():
+    # "cock" -> "rooster" grows the text, which must not push a chunk over the limit
+    chunks = prepare_chunks("The cock crowed. " * 400)
+
+    assert chunks
+    assert all(len(chunk) <= MURF_MAX_CHARS for chunk in chunks)
+    assert not any("cock" in chunk for chunk in chunks)
+
+
+def test_last_chunk_is_rebalanced_to_min_size():
+    # Greedy packing alone would leave a ~200 character last chunk here
+    sentences = [f"Sentence number {i} has a few words in it." for i in range(75)]
+    text = " ".join(sentences[:60]) + "\n\n" + " ".join(sentences[60:])
+
+    chunks = chunk_text(text, chunk_size=1000, min_chunk_size=300)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert len(chunks[-1]) >= 300
+    assert " ".join(chunks).split() == text.split()